@@ -22,12 +22,9 @@ def main():
     # Launch web GUI
     try:
         print("🌐 Launching OSRS PvP RL Web GUI...")
-        from web_gui import OSRSWebGUI
+        from web_gui import OSRSWebGUI, PARSER
         
-        import argparse
-        parser = argparse.ArgumentParser(description="OSRS PvP RL GUI")
-        parser.add_argument("--port", type=int, default=8080, help="Port for web GUI")
-        args, unknown = parser.parse_known_args()
+        args, unknown = PARSER.parse_known_args()
         
         app = OSRSWebGUI(port=args.port)
         app.run()
@@ -8,15 +8,70 @@ It handles conda environment creation, dependency installation, and validation o
 
 import os
 import sys
+import json
+import hashlib
 import subprocess
 import platform
+import re
 import shutil
+import tempfile
 import time
 import argparse
 from pathlib import Path
 from typing import Optional, List
 
 
+# Per-user cache for results that survive between setup runs
+_CACHE_DIR = Path.home() / ".cache" / "osrs_rl_setup"
+_PIP_CACHE_DIR = _CACHE_DIR / "pip"
+_RAY_REQUIREMENT = "ray[default]==2.7.1"
+
+# Runs `<cmd> --help` for every pvp_ml console script in one interpreter,
+# printing "OK <cmd>" or "FAIL <cmd> <reason>" per command
+_CLI_CHECK_SCRIPT = """
+import contextlib, io, shutil, sys
+from importlib.metadata import entry_points
+
+scripts = [ep for ep in entry_points(group='console_scripts') if ep.module.split('.')[0] == 'pvp_ml']
+if not scripts:
+    print('FAIL pvp-ml no console scripts installed')
+failed = not scripts
+for ep in scripts:
+    sys.argv = [ep.name, '--help']
+    try:
+        if shutil.which(ep.name) is None:
+            raise FileNotFoundError('not on PATH')
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            ep.load()()
+        raise RuntimeError('--help returned without exiting')
+    except SystemExit as e:
+        if e.code not in (0, None):
+            print('FAIL', ep.name, f'--help exited with {e.code}')
+            failed = True
+            continue
+        print('OK', ep.name)
+    except Exception as e:
+        print('FAIL', ep.name, e)
+        failed = True
+sys.exit(1 if failed else 0)
+"""
+
+# Matches the CPU/GPU-specific dependency lines in environment.yml, whether commented out or not
+_LINE_CLASSIFIER = re.compile(r"^(?P<indent>\s*)(?P<pfx>#?\s*-\s*)(?P<tag>cpuonly|pytorch-cuda)\b")
+
+
+def select_torch_variant(content: str, cpu_only: bool) -> str:
+    """Comment/uncomment the cpuonly and pytorch-cuda dependencies for the requested variant."""
+    lines = []
+    for line in content.splitlines(keepends=True):
+        m = _LINE_CLASSIFIER.match(line)
+        if m:
+            want_active = (m.group("tag") == "cpuonly") == cpu_only
+            line = f"{m.group('indent')}{'- ' if want_active else '# - '}{line[m.end('pfx'):]}"
+        lines.append(line)
+    return "".join(lines)
+
+
 class SetupManager:
     """Manages the complete setup process for the OSRS PvP RL project."""
     
@@ -25,19 +80,59 @@ class SetupManager:
         self.pvp_ml_dir = root_dir / "pvp-ml"
         self.simulation_dir = root_dir / "simulation-rsps" / "ElvargServer"
         self.env_name = "pvp"
+        self.env_path = self.pvp_ml_dir / "env"
+        self.env_path_str = str(self.env_path)
+        self._conda_run_prefix = ("conda", "run", "-p", self.env_path_str)
+        self._is_windows = platform.system() == "Windows"
+        self._version_cache: Optional[dict] = None
+        self._prereq_result: Optional[bool] = None
         
     def log(self, message: str, level: str = "INFO"):
         """Log a message with timestamp."""
         timestamp = time.strftime("%H:%M:%S")
         print(f"[{timestamp}] [{level}] {message}")
         
-    def run_command(self, command: List[str], cwd: Optional[Path] = None, check: bool = True) -> subprocess.CompletedProcess:
+    def run_command(
+        self, command: List[str], cwd: Optional[Path] = None, check: bool = True, stream: bool = False,
+        discard_output: bool = False
+    ) -> subprocess.CompletedProcess:
         """Run a shell command with proper error handling."""
         self.log(f"Running: {' '.join(command)}")
+        if discard_output:
+            # Only the exit status matters; don't pipe the output through Python at all
+            result = subprocess.run(
+                command,
+                cwd=cwd or self.root_dir,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+            if check and result.returncode != 0:
+                self.log(f"Command failed with exit code {result.returncode}", "ERROR")
+                raise subprocess.CalledProcessError(result.returncode, command)
+            return result
+        if stream:
+            # Relay output as it arrives instead of buffering the whole log of a long-running command
+            with subprocess.Popen(
+                command,
+                cwd=cwd or self.root_dir,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1
+            ) as process:
+                for line in process.stdout:
+                    self.log(line.rstrip())
+            if check and process.returncode != 0:
+                self.log(f"Command failed with exit code {process.returncode}", "ERROR")
+                raise subprocess.CalledProcessError(process.returncode, command)
+            return subprocess.CompletedProcess(command, process.returncode)
         try:
             result = subprocess.run(
                 command,
                 cwd=cwd or self.root_dir,
+                stdin=subprocess.DEVNULL,
                 capture_output=True,
                 text=True,
                 check=check
@@ -51,38 +146,74 @@ class SetupManager:
                 self.log(f"Error: {e.stderr.strip()}", "ERROR")
             raise
             
+    def cached_version(self, binary: str) -> Optional[str]:
+        """Get the `--version` output of a binary, cached on disk by its resolved path and mtime."""
+        path = shutil.which(binary)
+        if path is None:
+            return None
+        mtime_ns = os.stat(path).st_mtime_ns
+        
+        cache_file = _CACHE_DIR / "versions.json"
+        if self._version_cache is None:
+            try:
+                with open(cache_file, 'r') as f:
+                    self._version_cache = json.load(f)
+            except (OSError, ValueError):
+                self._version_cache = {}
+                
+        cached = self._version_cache.get(path)
+        if cached and cached.get("mtime_ns") == mtime_ns:
+            return cached["output"]
+            
+        try:
+            result = self.run_command([path, "--version"])
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            return None
+            
+        self._version_cache[path] = {"mtime_ns": mtime_ns, "output": result.stdout}
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump(self._version_cache, f, indent=2)
+        except OSError:
+            pass  # Caching is best-effort
+        return result.stdout
+        
     def check_prerequisites(self) -> bool:
-        """Check if all prerequisites are installed."""
+        """Check if all prerequisites are installed. The result is cached for this instance."""
+        if self._prereq_result is None:
+            self._prereq_result = self._compute_prerequisites()
+        return self._prereq_result
+        
+    def _compute_prerequisites(self) -> bool:
         self.log("Checking prerequisites...")
         
         # Check conda
-        try:
-            result = self.run_command(["conda", "--version"])
-            self.log(f"Found conda: {result.stdout.strip()}")
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        version = self.cached_version("conda")
+        if version is None:
             self.log("❌ Conda not found. Please install Miniconda or Anaconda first.", "ERROR")
             self.log("Download from: https://docs.conda.io/en/latest/miniconda.html")
             return False
+        self.log(f"Found conda: {version.strip()}")
             
         # Check Java
-        try:
-            result = self.run_command(["java", "--version"])
-            self.log(f"Found Java: {result.stdout.strip().split()[1]}")
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        version = self.cached_version("java")
+        if version is None:
             self.log("❌ Java not found. Java 17 will be installed via conda.", "WARNING")
+        else:
+            self.log(f"Found Java: {version.strip().split()[1]}")
             
         # Check git
-        try:
-            result = self.run_command(["git", "--version"])
-            self.log(f"Found git: {result.stdout.strip()}")
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        version = self.cached_version("git")
+        if version is None:
             self.log("❌ Git not found. Please install Git first.", "ERROR")
             return False
+        self.log(f"Found git: {version.strip()}")
             
         self.log("✅ Prerequisites check completed")
         return True
         
-    def setup_conda_environment(self, cpu_only: bool = False) -> bool:
+    def setup_conda_environment(self, cpu_only: bool = False, force_recreate: bool = False) -> bool:
         """Set up the conda environment for pvp-ml."""
         self.log("Setting up conda environment...")
         
@@ -91,20 +222,6 @@ class SetupManager:
             self.log(f"❌ Environment file not found: {env_file}", "ERROR")
             return False
         
-        # Remove existing environment if it exists
-        env_path = self.pvp_ml_dir / "env"
-        if env_path.exists():
-            self.log("Removing existing environment...")
-            try:
-                self.run_command(["conda", "env", "remove", "-p", str(env_path), "-y"], check=False)
-            except subprocess.CalledProcessError:
-                pass  # Continue even if removal fails
-            
-            # Force remove directory if still exists
-            import shutil
-            if env_path.exists():
-                shutil.rmtree(env_path, ignore_errors=True)
-        
         # Create modified environment.yml without local package
         self.log("Creating modified environment file...")
         with open(env_file, 'r') as f:
@@ -116,8 +233,28 @@ class SetupManager:
         # Configure for CPU-only if requested
         if cpu_only:
             self.log("Configuring for CPU-only training...")
-            content = content.replace("  # - cpuonly # [CPU]", "  - cpuonly # [CPU]")
-            content = content.replace("  - pytorch-cuda=12.1 # [GPU]", "  # - pytorch-cuda=12.1 # [GPU]")
+        content = select_torch_variant(content, cpu_only)
+        
+        # Skip the solve entirely if the existing environment was built from identical content
+        hash_file = self.env_path / ".osrs_rl_env_hash"
+        cfg_hash = hashlib.sha256(content.encode()).hexdigest()
+        if not force_recreate and hash_file.exists() and hash_file.read_text().strip() == cfg_hash:
+            self.log("✅ Environment up to date, skipping (use --force-recreate to rebuild)")
+            return True
+        
+        # Remove existing environment if it exists
+        if self.env_path.exists():
+            self.log("Removing existing environment...")
+            # A directory without conda-meta/history is a partial env that conda can't remove anyway
+            if (self.env_path / "conda-meta" / "history").exists():
+                try:
+                    self.run_command(["conda", "env", "remove", "-p", self.env_path_str, "-y"], check=False)
+                except subprocess.CalledProcessError:
+                    pass  # Continue even if removal fails
+            
+            # Force remove directory if still exists
+            if self.env_path.exists():
+                shutil.rmtree(self.env_path, ignore_errors=True)
             
         # Write to temporary file
         temp_env_file = self.pvp_ml_dir / "environment_temp.yml"
@@ -129,9 +266,9 @@ class SetupManager:
             self.log("Creating conda environment (this may take several minutes)...")
             result = self.run_command([
                 "conda", "env", "create", 
-                "-p", str(env_path),
+                "-p", self.env_path_str,
                 "-f", str(temp_env_file)
-            ], check=False)
+            ], check=False, stream=True)
             
             # Clean up temporary file
             temp_env_file.unlink()
@@ -145,12 +282,13 @@ class SetupManager:
                     self.run_command(["mamba", "--version"], check=False)
                     result = self.run_command([
                         "mamba", "env", "create", 
-                        "-p", str(env_path),
+                        "-p", self.env_path_str,
                         "-f", str(temp_env_file)
-                    ], check=False)
+                    ], check=False, stream=True)
                     
                     if result.returncode == 0:
                         self.log("✅ Conda environment created with mamba")
+                        hash_file.write_text(cfg_hash)
                         return True
                 except subprocess.CalledProcessError:
                     pass
@@ -160,6 +298,7 @@ class SetupManager:
                 return self.create_minimal_environment(cpu_only)
             else:
                 self.log("✅ Conda environment created successfully")
+                hash_file.write_text(cfg_hash)
                 return True
                 
         except subprocess.CalledProcessError as e:
@@ -170,14 +309,12 @@ class SetupManager:
         """Create a minimal conda environment when full setup fails."""
         self.log("Creating minimal environment...")
         
-        env_path = self.pvp_ml_dir / "env"
-        
         try:
             # Create basic Python environment
             self.run_command([
-                "conda", "create", "-p", str(env_path), 
+                "conda", "create", "-p", self.env_path_str, 
                 "python=3.10", "pip", "openjdk=17", "-y"
-            ])
+            ], stream=True)
             
             # Install core packages with pip
             core_packages = [
@@ -191,9 +328,9 @@ class SetupManager:
                 core_packages.extend(["torch", "torchvision", "torchaudio"])
                 
             self.run_command([
-                "conda", "run", "-p", str(env_path),
+                *self._conda_run_prefix, "--no-capture-output",
                 "pip", "install"
-            ] + core_packages)
+            ] + core_packages, stream=True)
             
             self.log("✅ Minimal environment created")
             return True
@@ -206,25 +343,32 @@ class SetupManager:
         """Install the pvp-ml package in development mode."""
         self.log("Installing pvp-ml package...")
         
+        pip_install = [
+            *self._conda_run_prefix, "--no-capture-output",
+            "pip", "install", "--cache-dir", str(_PIP_CACHE_DIR)
+        ]
         try:
-            env_path = self.pvp_ml_dir / "env"
-            
-            # First try to install Ray (it's often problematic)
-            self.log("Installing Ray...")
-            try:
-                self.run_command([
-                    "conda", "run", "-p", str(env_path),
-                    "pip", "install", "ray[default]==2.7.1", "--timeout=300"
-                ], check=False)
-            except subprocess.CalledProcessError:
-                self.log("⚠️ Ray installation failed, continuing without it", "WARNING")
+            # Install Ray and the local package in one resolver run (pvp-ml declares no dependencies of its own)
+            result = self.run_command(
+                pip_install + ["--timeout=300", _RAY_REQUIREMENT, "-e", "."],
+                cwd=self.pvp_ml_dir, check=False, stream=True
+            )
             
-            # Install the local package
-            self.log("Installing local pvp-ml package...")
-            self.run_command([
-                "conda", "run", "-p", str(env_path),
-                "pip", "install", "-e", ".", "--no-deps"
-            ], cwd=self.pvp_ml_dir)
+            if result.returncode != 0:
+                # Ray is often problematic; install it separately so it can't block the local package
+                self.log("Combined install failed, installing Ray separately...", "WARNING")
+                result = self.run_command(
+                    pip_install + ["--timeout=300", _RAY_REQUIREMENT],
+                    check=False, stream=True
+                )
+                if result.returncode != 0:
+                    self.log("⚠️ Ray installation failed, continuing without it", "WARNING")
+                
+                self.log("Installing local pvp-ml package...")
+                self.run_command(
+                    pip_install + ["-e", ".", "--no-deps"],
+                    cwd=self.pvp_ml_dir, stream=True
+                )
             
             self.log("✅ pvp-ml package installed successfully")
             return True
@@ -235,11 +379,10 @@ class SetupManager:
             # Try alternative installation
             self.log("Trying alternative installation method...", "INFO")
             try:
-                env_path = self.pvp_ml_dir / "env"
                 self.run_command([
-                    "conda", "run", "-p", str(env_path),
+                    *self._conda_run_prefix, "--no-capture-output",
                     "python", "setup.py", "develop"
-                ], cwd=self.pvp_ml_dir, check=False)
+                ], cwd=self.pvp_ml_dir, check=False, stream=True)
                 
                 self.log("✅ Alternative installation succeeded")
                 return True
@@ -247,28 +390,32 @@ class SetupManager:
                 self.log("❌ All installation methods failed", "ERROR")
                 return False
             
-    def validate_installation(self) -> bool:
+    def validate_installation(self, fast: bool = False) -> bool:
         """Validate that all components are properly installed."""
         self.log("Validating installation...")
         
-        env_path = self.pvp_ml_dir / "env"
-        
-        # Test CLI commands
-        commands_to_test = ["train", "serve-api", "eval"]
-        for cmd in commands_to_test:
-            try:
-                result = self.run_command([
-                    "conda", "run", "-p", str(env_path),
-                    cmd, "--help"
-                ], check=False)
-                if result.returncode == 0:
-                    self.log(f"✅ Command '{cmd}' is working")
-                else:
-                    self.log(f"❌ Command '{cmd}' failed", "ERROR")
-                    return False
-            except subprocess.CalledProcessError:
-                self.log(f"❌ Command '{cmd}' not found", "ERROR")
-                return False
+        # Test CLI commands in a single interpreter, from a file since conda run rejects arguments containing newlines
+        with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as script:
+            script.write(_CLI_CHECK_SCRIPT)
+        try:
+            result = self.run_command([*self._conda_run_prefix, "python", script.name], check=False)
+        finally:
+            os.unlink(script.name)
+        for line in result.stdout.splitlines():
+            status, _, rest = line.partition(" ")
+            cmd = rest.split(" ", 1)[0]
+            if status == "OK":
+                self.log(f"✅ Command '{cmd}' is working")
+            elif status == "FAIL":
+                self.log(f"❌ Command '{cmd}' failed: {rest[len(cmd):].strip()}", "ERROR")
+        if result.returncode != 0:
+            self.log(f"❌ CLI command check failed with exit code {result.returncode}", "ERROR")
+            return False
+                
+        if fast:
+            self.log("Skipping Java build validation (--fast)")
+            self.log("✅ Installation validation completed")
+            return True
                 
         # Test Java simulation
         self.log("Testing Java simulation server...")
@@ -284,9 +431,10 @@ class SetupManager:
             
             # Test gradle build (don't actually run the server)
             result = self.run_command(
-                ["./gradlew", "build", "--info"],
+                ["./gradlew", "build"],
                 cwd=self.simulation_dir,
-                check=False
+                check=False,
+                discard_output=True
             )
             
             if result.returncode == 0:
@@ -301,113 +449,36 @@ class SetupManager:
         return True
         
     def create_launcher_scripts(self):
-        """Create convenient launcher scripts."""
-        self.log("Creating launcher scripts...")
+        """Check the launcher scripts shipped at the project root are present and usable."""
+        self.log("Checking launcher scripts...")
         
-        # Create shell script for Unix systems
-        if platform.system() != "Windows":
-            launcher_script = self.root_dir / "launch.sh"
-            script_content = f"""#!/bin/bash
-# OSRS PvP RL - Quick Launcher
-
-export PROJECT_ROOT="{self.root_dir}"
-export CONDA_ENV_PATH="{self.pvp_ml_dir / 'env'}"
-
-echo "OSRS PvP Reinforcement Learning - Launcher"
-echo "========================================="
-echo ""
-echo "Available commands:"
-echo "  1. gui           - Launch GUI interface"
-echo "  2. train         - Start training (requires preset)"
-echo "  3. eval          - Evaluate model"
-echo "  4. serve-api     - Serve models via API"
-echo "  5. tensorboard   - View training progress"
-echo "  6. simulation    - Start simulation server"
-echo ""
-
-if [ "$1" = "gui" ]; then
-    echo "Launching GUI..."
-    conda run -p "$CONDA_ENV_PATH" python gui.py
-elif [ "$1" = "train" ]; then
-    echo "Starting training..."
-    conda run -p "$CONDA_ENV_PATH" train "${{@:2}}"
-elif [ "$1" = "eval" ]; then
-    echo "Starting evaluation..."
-    conda run -p "$CONDA_ENV_PATH" eval "${{@:2}}"
-elif [ "$1" = "serve-api" ]; then
-    echo "Starting API server..."
-    conda run -p "$CONDA_ENV_PATH" serve-api "${{@:2}}"
-elif [ "$1" = "tensorboard" ]; then
-    echo "Starting Tensorboard..."
-    conda run -p "$CONDA_ENV_PATH" train tensorboard
-elif [ "$1" = "simulation" ]; then
-    echo "Starting simulation server..."
-    cd "{self.simulation_dir}"
-    ./gradlew run
-else
-    echo "Usage: ./launch.sh <command> [arguments...]"
-    echo "       ./launch.sh gui"
-fi
-"""
-            with open(launcher_script, 'w') as f:
-                f.write(script_content)
-            os.chmod(launcher_script, 0o755)
+        # The launchers locate the project from their own path, so they never need regenerating
+        launcher = self.root_dir / ("launch.bat" if self._is_windows else "launch.sh")
+        if not launcher.exists():
+            self.log(f"⚠️  Launcher script missing: {launcher} (restore it with git checkout)", "WARNING")
+            return
             
-        # Create batch script for Windows
-        launcher_bat = self.root_dir / "launch.bat"
-        bat_content = f"""@echo off
-REM OSRS PvP RL - Quick Launcher (Windows)
-
-set PROJECT_ROOT={self.root_dir}
-set CONDA_ENV_PATH={self.pvp_ml_dir / 'env'}
-
-echo OSRS PvP Reinforcement Learning - Launcher
-echo =========================================
-echo.
-
-if "%1"=="gui" (
-    echo Launching GUI...
-    conda run -p "%CONDA_ENV_PATH%" python gui.py
-) else if "%1"=="train" (
-    echo Starting training...
-    conda run -p "%CONDA_ENV_PATH%" train %*
-) else if "%1"=="eval" (
-    echo Starting evaluation...
-    conda run -p "%CONDA_ENV_PATH%" eval %*
-) else if "%1"=="serve-api" (
-    echo Starting API server...
-    conda run -p "%CONDA_ENV_PATH%" serve-api %*
-) else if "%1"=="tensorboard" (
-    echo Starting Tensorboard...
-    conda run -p "%CONDA_ENV_PATH%" train tensorboard
-) else if "%1"=="simulation" (
-    echo Starting simulation server...
-    cd /d "{self.simulation_dir}"
-    gradlew.bat run
-) else (
-    echo Usage: launch.bat ^<command^> [arguments...]
-    echo        launch.bat gui
-)
-"""
-        with open(launcher_bat, 'w') as f:
-            f.write(bat_content)
+        if not self._is_windows:
+            mode = launcher.stat().st_mode
+            if mode & 0o111 != 0o111:
+                os.chmod(launcher, mode | 0o755)
             
-        self.log("✅ Launcher scripts created")
+        self.log("✅ Launcher scripts ready")
         
-    def run_full_setup(self, cpu_only: bool = False) -> bool:
+    def run_full_setup(self, cpu_only: bool = False, force_recreate: bool = False, fast: bool = False) -> bool:
         """Run the complete setup process."""
         self.log("Starting full setup process...")
         
         if not self.check_prerequisites():
             return False
             
-        if not self.setup_conda_environment(cpu_only):
+        if not self.setup_conda_environment(cpu_only, force_recreate):
             return False
             
         if not self.install_pvp_ml():
             return False
             
-        if not self.validate_installation():
+        if not self.validate_installation(fast):
             return False
             
         self.create_launcher_scripts()
@@ -415,7 +486,7 @@ if "%1"=="gui" (
         self.log("🎉 Setup completed successfully!")
         self.log("")
         self.log("Quick start:")
-        if platform.system() != "Windows":
+        if not self._is_windows:
             self.log("  ./launch.sh gui          # Launch GUI")
             self.log("  ./launch.sh train --help # View training options")
         else:
@@ -442,6 +513,16 @@ def main():
         action="store_true",
         help="Only check prerequisites without installing"
     )
+    parser.add_argument(
+        "--force-recreate",
+        action="store_true",
+        help="Recreate the conda environment even if it is up to date"
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Skip gradle build validation"
+    )
     
     args = parser.parse_args()
     
@@ -454,7 +535,9 @@ def main():
         success = setup_manager.check_prerequisites()
         sys.exit(0 if success else 1)
     else:
-        success = setup_manager.run_full_setup(cpu_only=args.cpu_only)
+        success = setup_manager.run_full_setup(
+            cpu_only=args.cpu_only, force_recreate=args.force_recreate, fast=args.fast
+        )
         sys.exit(0 if success else 1)
 
 
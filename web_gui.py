@@ -8,19 +8,72 @@ This version uses a simple web interface instead of tkinter for better compatibi
 
 import sys
 import os
+import argparse
+import shutil
+import socket
+import stat
 import subprocess
 import threading
+import signal
+import selectors
 import time
 import json
+import re
+import gzip
+import zlib
+import hashlib
 import yaml
 import webbrowser
+from collections import deque
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Callable
 from dataclasses import dataclass
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import socketserver
 import urllib.parse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# libyaml's parser when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# A top-level mapping key opening a block, optionally anchored or commented: `Name:`, `Name: &anchor  # note`
+PRESET_KEY = re.compile(rb'^([A-Za-z_][\w.-]*):[ \t]*(?:&\S+[ \t]*)?(?:#[^\n]*)?\r?$', re.MULTILINE)
+
+# Output pipe capacity: lets chatty processes write ahead without blocking and the pump read in bulk
+PIPE_SIZE = 1 << 20
+
+# Python's own fds are close-on-exec (PEP 446), so POSIX children can skip the close_fds sweep
+INHERIT_SAFE_CLOSE_FDS = os.name == 'nt'
+
+
+def dumps_json(data: Any) -> bytes:
+    """Encode data as UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+
+def loads_json(data):
+    """Decode JSON from bytes or str, using orjson when it is installed (both raise ValueError)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 @dataclass
 class ProcessInfo:
@@ -31,93 +84,394 @@ class ProcessInfo:
     start_time: float
 
 
-class WebGUIHandler(SimpleHTTPRequestHandler):
+# Result of an action that worked, and its encoding
+SUCCESS: Dict[str, Any] = {'success': True}
+SUCCESS_JSON = dumps_json(SUCCESS)
+
+
+def encode_log_delta(next_seq: int, reset: bool, fragments: List[bytes]) -> bytes:
+    """Assemble a log delta's JSON object from already-encoded lines."""
+    return b'{"next":%d,"lines":[%s],"reset":%s}' % (next_seq, b','.join(fragments), b'true' if reset else b'false')
+
+
+class LogBuffer:
+    """Bounded buffer of output lines, each tagged with an increasing sequence number.
+    
+    Lines are JSON-encoded once on the way in, so fanning them out to many clients never re-escapes them.
+    """
+    
+    def __init__(self, maxlen: int = 500):
+        self._lines: deque = deque(maxlen=maxlen)
+        self._next_seq = 0
+        self._lock = threading.Lock()
+        # Joined text as of a sequence number: (next_seq, text)
+        self._text: Tuple[int, str] = (0, "")
+    
+    def __len__(self):
+        return len(self._lines)
+    
+    def extend(self, lines):
+        encoded = [(line, dumps_json(line)) for line in lines]
+        with self._lock:
+            for line, fragment in encoded:
+                self._lines.append((self._next_seq, line, fragment))
+                self._next_seq += 1
+    
+    def append(self, line: str):
+        self.extend((line,))
+    
+    def text(self) -> str:
+        """Get the buffered lines as one string, joining them again only after new output."""
+        with self._lock:
+            if self._text[0] != self._next_seq:
+                self._text = (self._next_seq, "\n".join(line for _, line, _ in self._lines))
+            return self._text[1]
+    
+    def since(self, seq: Optional[int]) -> Tuple[int, bool, List[bytes]]:
+        """Get the encoded lines from seq onwards as (next cursor, reset, lines); reset means resend everything."""
+        with self._lock:
+            next_seq = self._next_seq
+            reset = seq is None or seq > next_seq
+            if reset:
+                fragments = [fragment for _, _, fragment in self._lines]
+            else:
+                # Walk back from the newest line; a caught-up client only needs the tail
+                fragments = []
+                for s, _, fragment in reversed(self._lines):
+                    if s < seq:
+                        break
+                    fragments.append(fragment)
+                fragments.reverse()
+        return next_seq, reset, fragments
+
+
+class PooledHTTPServer(ThreadingHTTPServer):
+    """HTTP server that dispatches requests to a fixed pool of worker threads."""
+    
+    max_workers = 16
+    max_pending = 32
+    # Event streams hold a worker while the page is open; cap them so ordinary requests still get one
+    max_streams = 8
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="web-gui")
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_pending)
+        self.stream_slots = threading.BoundedSemaphore(self.max_streams)
+        # Connections currently held by a worker, so closing the server can unblock them
+        self._active: set = set()
+        self._active_lock = threading.Lock()
+        self._closed = False
+    
+    def get_request(self):
+        request, client_address = super().get_request()
+        # Don't let Nagle delay small responses on keep-alive connections
+        request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # Lets the kernel notice peers that vanished without closing (a slept laptop holding an event stream)
+        request.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        return request, client_address
+    
+    def process_request(self, request, client_address):
+        """Hand the request to the pool, shedding load once the backlog is full."""
+        if not self._slots.acquire(blocking=False):
+            self.shutdown_request(request)
+            return
+        self._executor.submit(self._process_and_release, request, client_address)
+    
+    def _process_and_release(self, request, client_address):
+        with self._active_lock:
+            closed = self._closed
+            if not closed:
+                self._active.add(request)
+        try:
+            if closed:
+                # Still queued when the server closed; drop it rather than serve it
+                self.shutdown_request(request)
+            else:
+                self.process_request_thread(request, client_address)
+        finally:
+            with self._active_lock:
+                self._active.discard(request)
+            self._slots.release()
+    
+    def server_close(self):
+        """Stop accepting work and wake workers idling on keep-alive reads, so exit doesn't wait on them."""
+        super().server_close()
+        self._executor.shutdown(wait=False)
+        with self._active_lock:
+            self._closed = True
+            for request in self._active:
+                try:
+                    request.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+
+class WebGUIHandler(BaseHTTPRequestHandler):
     """Custom handler for the web GUI."""
     
+    # Reuse connections across requests; every response carries Content-Length (or closes)
+    protocol_version = 'HTTP/1.1'
+    
+    # Don't let a stalled or idle keep-alive client hold a pool worker for long
+    timeout = 10
+    
     def __init__(self, *args, gui_app=None, **kwargs):
         self.gui_app = gui_app
         super().__init__(*args, **kwargs)
     
+    def log_error(self, format, *args):
+        # Browsers park idle keep-alive sockets; one reaching `timeout` is routine, not an error
+        if format.startswith('Request timed out'):
+            return
+        super().log_error(format, *args)
+    
+    # Dispatch tables: path -> handler
+    GET_ROUTES: Dict[str, Callable[['WebGUIHandler'], None]] = {
+        '/': lambda self: self.send_main_html(),
+        '/api/status': lambda self: self.send_json_bytes(self.gui_app.get_status_json()),
+        '/api/presets': lambda self: self.send_json_bytes(self.gui_app.get_presets_json(), max_age=5),
+        '/api/models': lambda self: self.send_json_bytes(
+            self.gui_app.get_models_json(), max_age=5
+        ),
+        '/api/events': lambda self: self.send_event_stream(),
+        '/api/logs': lambda self: self.send_log_batch(),
+        '/api/tensorboard_ready': lambda self: self.send_tensorboard_ready(),
+        '/api/check_environment': lambda self: self.send_environment_check(),
+        '/SETUP_GUIDE.md': lambda self: self.send_setup_guide(),
+    }
+    POST_ROUTES: Dict[str, Callable[['OSRSWebGUI', Optional[Dict]], Dict]] = {
+        '/api/start_training': lambda app, data: app.start_training(data),
+        '/api/stop_training': lambda app, data: app.stop_training(),
+        '/api/start_evaluation': lambda app, data: app.start_evaluation(data),
+        '/api/stop_evaluation': lambda app, data: app.stop_evaluation(),
+        '/api/start_api': lambda app, data: app.start_api_server(data),
+        '/api/stop_api': lambda app, data: app.stop_api_server(),
+        '/api/start_simulation': lambda app, data: app.start_simulation(),
+        '/api/stop_simulation': lambda app, data: app.stop_simulation(),
+        '/api/start_tensorboard': lambda app, data: app.start_tensorboard(),
+        '/api/stop_tensorboard': lambda app, data: app.stop_tensorboard(),
+    }
+    POST_NEEDS_BODY = frozenset({'/api/start_training', '/api/start_evaluation', '/api/start_api'})
+    # POST bodies are small config objects; anything larger is refused before reading it
+    max_body_size = 64 * 1024
+    
+    def end_headers(self, body: bytes = b''):
+        """Finish the headers, sending body in the same write so a small response leaves as one packet."""
+        # Advertise the idle timeout so the browser retires the connection before we drop it
+        if not self.close_connection:
+            self.send_header('Keep-Alive', f'timeout={self.timeout - 1}')
+        if body and hasattr(self, '_headers_buffer'):
+            # What BaseHTTPRequestHandler.end_headers does, with the body joined onto the buffered headers
+            self._headers_buffer.append(b"\r\n")
+            self._headers_buffer.append(body)
+            self.flush_headers()
+            return
+        super().end_headers()
+        if body:
+            self.wfile.write(body)
+    
     def do_GET(self):
         """Handle GET requests."""
-        if self.path == '/':
-            self.send_html_response(self.get_main_html())
-        elif self.path == '/api/status':
-            self.send_json_response(self.gui_app.get_status())
-        elif self.path == '/api/presets':
-            self.send_json_response(self.gui_app.get_presets())
-        elif self.path == '/api/models':
-            self.send_json_response(self.gui_app.get_models())
+        path = urllib.parse.urlsplit(self.path).path
+        route = self.GET_ROUTES.get(path)
+        if route is not None:
+            route(self)
+        elif path in _STATIC:
+            self.send_precompressed(*_STATIC[path], cache_control='public, max-age=31536000, immutable')
         elif self.path.startswith('/api/logs/'):
-            log_type = self.path.split('/')[-1]
-            self.send_json_response({'logs': self.gui_app.get_logs(log_type)})
+            url = urllib.parse.urlsplit(self.path)
+            log_type = url.path.split('/')[-1]
+            since = urllib.parse.parse_qs(url.query).get('since')
+            if since and since[0].isascii() and since[0].isdigit():
+                self.send_json_bytes(encode_log_delta(*self.gui_app.get_log_delta(log_type, int(since[0]))))
+            else:
+                self.send_json_response({'logs': self.gui_app.get_logs(log_type)})
         else:
-            super().do_GET()
+            self.send_error(404)
     
     def do_POST(self):
         """Handle POST requests."""
-        content_length = int(self.headers['Content-Length'])
-        post_data = self.rfile.read(content_length)
-        data = json.loads(post_data.decode('utf-8'))
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            content_length = -1
+        # Either way the body is left unread, so the connection can't be reused
+        if content_length < 0:
+            self.close_connection = True
+            self.send_error(400, "Invalid Content-Length")
+            return
+        if content_length > self.max_body_size:
+            self.close_connection = True
+            self.send_error(413, f"Request body exceeds {self.max_body_size} bytes")
+            return
+        data = None
+        if self.path in self.POST_NEEDS_BODY:
+            try:
+                data = loads_json(self.rfile.read(content_length))
+            except ValueError:
+                self.send_error(400, "Request body is not valid JSON")
+                return
+        elif content_length:
+            # Nothing to parse, but the body must still be consumed to keep the connection usable
+            self.rfile.read(content_length)
         
-        if self.path == '/api/start_training':
-            result = self.gui_app.start_training(data)
-            self.send_json_response(result)
-        elif self.path == '/api/stop_training':
-            result = self.gui_app.stop_training()
-            self.send_json_response(result)
-        elif self.path == '/api/start_evaluation':
-            result = self.gui_app.start_evaluation(data)
-            self.send_json_response(result)
-        elif self.path == '/api/stop_evaluation':
-            result = self.gui_app.stop_evaluation()
-            self.send_json_response(result)
-        elif self.path == '/api/start_api':
-            result = self.gui_app.start_api_server(data)
-            self.send_json_response(result)
-        elif self.path == '/api/stop_api':
-            result = self.gui_app.stop_api_server()
-            self.send_json_response(result)
-        elif self.path == '/api/start_simulation':
-            result = self.gui_app.start_simulation()
-            self.send_json_response(result)
-        elif self.path == '/api/stop_simulation':
-            result = self.gui_app.stop_simulation()
-            self.send_json_response(result)
-        elif self.path == '/api/start_tensorboard':
-            result = self.gui_app.start_tensorboard()
-            self.send_json_response(result)
-        elif self.path == '/api/stop_tensorboard':
-            result = self.gui_app.stop_tensorboard()
-            self.send_json_response(result)
-        else:
+        route = self.POST_ROUTES.get(self.path)
+        if route is None:
             self.send_error(404)
+            return
+        result = route(self.gui_app, data)
+        # Nearly every action answers plain success, which never needs encoding
+        self.send_json_bytes(SUCCESS_JSON if result == SUCCESS else dumps_json(result))
     
-    def send_html_response(self, html):
-        """Send HTML response."""
+    def send_log_batch(self):
+        """Send new log lines for several processes in one response (?names=training,api&since=12,0)."""
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        names = [name for name in query.get('names', [','.join(LOG_PANES)])[0].split(',') if name]
+        since = [int(seq) if seq.isascii() and seq.isdigit() else None for seq in query.get('since', [''])[0].split(',')]
+        cursors = {name: since[i] if i < len(since) else None for i, name in enumerate(names)}
+        self.send_json_bytes(self.gui_app.get_log_batch(cursors))
+    
+    def send_environment_check(self):
+        """Send the environment check, reusing a recent result unless ?refresh=1 (or ?force=1)."""
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        if query.get('refresh') == ['1'] or query.get('force') == ['1']:
+            self.gui_app.invalidate_json_cache('check_environment')
+        self.send_json_bytes(
+            self.gui_app.cached_json('check_environment', self.gui_app.check_environment, ttl=30)
+        )
+    
+    def send_tensorboard_ready(self):
+        """Report whether Tensorboard accepts connections, waiting up to ?wait= seconds for it."""
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        try:
+            wait = min(float(query.get('wait', ['0'])[0]), 30.0)
+        except ValueError:
+            self.send_error(400, "wait must be a number of seconds")
+            return
+        self.send_json_response({'ready': self.gui_app.tensorboard_ready.wait(wait)})
+    
+    def send_event_stream(self):
+        """Push status and log updates to the browser as Server-Sent Events until it disconnects."""
+        if not self.server.stream_slots.acquire(blocking=False):
+            self.send_response(503)
+            self.send_header('Retry-After', '5')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        try:
+            self._stream_events()
+        finally:
+            self.server.stream_slots.release()
+    
+    def _stream_events(self):
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        # One gzip stream for the whole connection, flushed per event
+        compressor = None
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            compressor = zlib.compressobj(1, zlib.DEFLATED, 31)
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Vary', 'Accept-Encoding')
+        # The stream has no length, so the connection can't be reused afterwards
+        self.send_header('Connection', 'close')
+        self.close_connection = True
+        version = None
+        cursors: Dict[str, int] = {}
+        try:
+            self.end_headers()
+            while not self.gui_app.closing.is_set():
+                sent_at = time.monotonic()
+                event = b'data: ' + self.gui_app.get_events(cursors) + b'\n\n'
+                if compressor is not None:
+                    event = compressor.compress(event) + compressor.flush(zlib.Z_SYNC_FLUSH)
+                self.wfile.write(event)
+                self.wfile.flush()
+                # Coalesce bursts of output into at most a few events per second
+                time.sleep(max(0.0, sent_at + 0.25 - time.monotonic()))
+                # Wake on any change, or periodically to refresh system metrics (rarely when idle)
+                idle = not any(self.gui_app.running_snapshot())
+                version = self.gui_app.wait_for_change(version, timeout=30 if idle else 5)
+        except OSError:
+            pass  # Reader went away (reset, aborted) or stopped reading until the socket timed out
+    
+    def send_setup_guide(self):
+        """Send the setup guide from the project root, as plain text so the browser shows it."""
+        try:
+            body = (self.gui_app.project_root / "SETUP_GUIDE.md").read_bytes()
+        except OSError:
+            self.send_error(404)
+            return
         self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        self.wfile.write(html.encode('utf-8'))
+        self.send_header('Content-type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers(body)
+    
+    def send_main_html(self):
+        """Send the pre-encoded main page."""
+        self.send_precompressed(_MAIN_HTML, _MAIN_HTML_GZ, _MAIN_HTML_ETAG, 'text/html; charset=utf-8')
+    
+    def send_precompressed(
+        self, body: bytes, gz_body: bytes, etag: str, content_type: str, cache_control: Optional[str] = None
+    ):
+        """Send a body compressed ahead of time, or 304 if the browser already has it."""
+        gzipped = 'gzip' in self.headers.get('Accept-Encoding', '')
+        # Each encoding is a different representation, so it gets its own validator
+        if gzipped:
+            body, etag = gz_body, etag[:-1] + '-gzip"'
+        if self.etag_matches(etag):
+            # Repeat the caching headers so the browser renews its copy's freshness
+            self.send_response(304)
+            self.send_header('Vary', 'Accept-Encoding')
+            if cache_control is not None:
+                self.send_header('Cache-Control', cache_control)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        if cache_control is not None:
+            self.send_header('Cache-Control', cache_control)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers(body)
+    
+    def etag_matches(self, etag: str) -> bool:
+        """Check If-None-Match against etag: any entry of the list, weak or strong, or *."""
+        header = self.headers.get('If-None-Match')
+        if not header:
+            return False
+        if header == etag:
+            return True
+        candidates = (candidate.strip() for candidate in header.split(','))
+        return any(candidate == '*' or (candidate[2:] if candidate.startswith('W/') else candidate) == etag for candidate in candidates)
     
     def send_json_response(self, data):
         """Send JSON response."""
+        self.send_json_bytes(dumps_json(data))
+    
+    def send_json_bytes(self, body: bytes, max_age: Optional[int] = None):
+        """Send an already-encoded JSON response, gzipped when large and the client accepts it."""
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
+        if len(body) > 1024 and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body, compresslevel=1)
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(body)))
         self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(data).encode('utf-8'))
+        if max_age is not None:
+            self.send_header('Cache-Control', f'max-age={max_age}')
+        self.end_headers(body)
     
-    def get_main_html(self):
-        """Generate the main HTML interface."""
+    @staticmethod
+    def get_main_css():
+        """Generate the stylesheet for the main page."""
         return """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>OSRS PvP Reinforcement Learning</title>
-    <style>
         body { 
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             margin: 0; padding: 20px; background: #f5f5f5;
@@ -148,164 +502,16 @@ class WebGUIHandler(SimpleHTTPRequestHandler):
         .process-running { background: #d4edda; color: #155724; }
         .process-stopped { background: #f8d7da; color: #721c24; }
         .metrics { background: #f8f9fa; padding: 15px; border-radius: 5px; font-family: monospace; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🗡️ OSRS PvP Reinforcement Learning</h1>
-        
-        <div class="tabs">
-            <button class="tab active" onclick="showTab('setup')">Setup & Status</button>
-            <button class="tab" onclick="showTab('training')">Training</button>
-            <button class="tab" onclick="showTab('evaluation')">Evaluation</button>
-            <button class="tab" onclick="showTab('monitoring')">Monitoring</button>
-            <button class="tab" onclick="showTab('api')">API Server</button>
-            <button class="tab" onclick="showTab('simulation')">Simulation</button>
-        </div>
-
-        <!-- Setup Tab -->
-        <div id="setup" class="tab-content active">
-            <div class="section">
-                <h3>Environment Status</h3>
-                <div id="status-grid" class="status-grid">
-                    <div class="status-item" id="conda-status">
-                        <h4>Conda Environment</h4>
-                        <div>Status: <span id="conda-status-text">Checking...</span></div>
-                    </div>
-                    <div class="status-item" id="python-status">
-                        <h4>Python Packages</h4>
-                        <div>Status: <span id="python-status-text">Checking...</span></div>
-                    </div>
-                    <div class="status-item" id="java-status">
-                        <h4>Java Runtime</h4>
-                        <div>Status: <span id="java-status-text">Checking...</span></div>
-                    </div>
-                    <div class="status-item" id="simulation-status">
-                        <h4>Simulation Server</h4>
-                        <div>Status: <span id="simulation-status-text">Checking...</span></div>
-                    </div>
-                </div>
-                <button class="btn btn-primary" onclick="checkEnvironment()">Check Environment</button>
-                <button class="btn btn-secondary" onclick="openSetupGuide()">Open Setup Guide</button>
-            </div>
-        </div>
-
-        <!-- Training Tab -->
-        <div id="training" class="tab-content">
-            <div class="section">
-                <h3>Training Configuration</h3>
-                <div class="form-group">
-                    <label for="preset-select">Training Preset:</label>
-                    <select id="preset-select">
-                        <option value="">Loading presets...</option>
-                    </select>
-                </div>
-                <div class="form-group">
-                    <label>
-                        <input type="checkbox" id="distributed-training"> Distributed Training
-                    </label>
-                </div>
-                <div class="form-group">
-                    <label for="workers-input">Parallel Workers:</label>
-                    <input type="text" id="workers-input" value="auto" placeholder="auto or number">
-                </div>
-                <div>
-                    <button class="btn btn-success" id="start-training-btn" onclick="startTraining()">Start Training</button>
-                    <button class="btn btn-danger" id="stop-training-btn" onclick="stopTraining()" disabled>Stop Training</button>
-                    <button class="btn btn-primary" onclick="openTensorboard()">View Progress</button>
-                </div>
-                <div id="training-status" style="margin-top: 15px; font-weight: bold;"></div>
-            </div>
-            <div class="section">
-                <h3>Training Logs</h3>
-                <div id="training-logs" class="logs"></div>
-            </div>
-        </div>
-
-        <!-- Evaluation Tab -->
-        <div id="evaluation" class="tab-content">
-            <div class="section">
-                <h3>Model Selection</h3>
-                <div class="form-group">
-                    <label for="model-select">Model:</label>
-                    <select id="model-select">
-                        <option value="">Loading models...</option>
-                    </select>
-                </div>
-                <div>
-                    <button class="btn btn-success" id="start-eval-btn" onclick="startEvaluation()">Start Evaluation</button>
-                    <button class="btn btn-danger" id="stop-eval-btn" onclick="stopEvaluation()" disabled>Stop Evaluation</button>
-                    <button class="btn btn-secondary" onclick="startSimulation()">Start Simulation</button>
-                </div>
-                <div id="evaluation-status" style="margin-top: 15px; font-weight: bold;"></div>
-            </div>
-            <div class="section">
-                <h3>Evaluation Logs</h3>
-                <div id="evaluation-logs" class="logs"></div>
-            </div>
-        </div>
-
-        <!-- Monitoring Tab -->
-        <div id="monitoring" class="tab-content">
-            <div class="section">
-                <h3>Tensorboard</h3>
-                <div>
-                    <button class="btn btn-success" id="start-tb-btn" onclick="startTensorboard()">Start Tensorboard</button>
-                    <button class="btn btn-danger" id="stop-tb-btn" onclick="stopTensorboard()" disabled>Stop Tensorboard</button>
-                    <button class="btn btn-primary" onclick="openTensorboard()">Open in Browser</button>
-                </div>
-                <div id="tensorboard-status" style="margin-top: 15px; font-weight: bold;"></div>
-            </div>
-            <div class="section">
-                <h3>System Metrics</h3>
-                <div id="system-metrics" class="metrics">Loading metrics...</div>
-            </div>
-        </div>
-
-        <!-- API Tab -->
-        <div id="api" class="tab-content">
-            <div class="section">
-                <h3>API Server Configuration</h3>
-                <div class="form-group">
-                    <label for="api-host">Host:</label>
-                    <input type="text" id="api-host" value="127.0.0.1">
-                </div>
-                <div class="form-group">
-                    <label for="api-port">Port:</label>
-                    <input type="text" id="api-port" value="9999">
-                </div>
-                <div>
-                    <button class="btn btn-success" id="start-api-btn" onclick="startApiServer()">Start API Server</button>
-                    <button class="btn btn-danger" id="stop-api-btn" onclick="stopApiServer()" disabled>Stop API Server</button>
-                </div>
-                <div id="api-status" style="margin-top: 15px; font-weight: bold;"></div>
-            </div>
-        </div>
-
-        <!-- Simulation Tab -->
-        <div id="simulation" class="tab-content">
-            <div class="section">
-                <h3>Simulation Server</h3>
-                <div>
-                    <button class="btn btn-success" id="start-sim-btn" onclick="startSimulation()">Start Simulation</button>
-                    <button class="btn btn-danger" id="stop-sim-btn" onclick="stopSimulation()" disabled>Stop Simulation</button>
-                </div>
-                <div id="sim-status" style="margin-top: 15px; font-weight: bold;"></div>
-                <div style="margin-top: 15px; padding: 15px; background: #e9ecef; border-radius: 5px;">
-                    <strong>Connection Info:</strong><br>
-                    Game Server: localhost:43595 (for RSPS clients)<br>
-                    RL API Server: localhost:43594 (for training/evaluation)
-                </div>
-            </div>
-            <div class="section">
-                <h3>Simulation Logs</h3>
-                <div id="simulation-logs" class="logs"></div>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        let statusUpdateInterval;
+"""
+    
+    @staticmethod
+    def get_main_js():
+        """Generate the script for the main page."""
+        return """
+        let events;
+        // Same cap as the server's per-process log buffer
+        const MAX_LOG_LINES = 500;
+        const logLineCounts = {};
 
         function showTab(tabName) {
             // Hide all tabs
@@ -332,27 +538,86 @@ class WebGUIHandler(SimpleHTTPRequestHandler):
             return await response.json();
         }
 
-        async function updateStatus() {
-            try {
-                const status = await apiCall('status');
-                
-                // Update process statuses
-                updateProcessStatus('training', status.processes.training);
-                updateProcessStatus('evaluation', status.processes.evaluation);
-                updateProcessStatus('api', status.processes.api);
-                updateProcessStatus('simulation', status.processes.simulation);
-                updateProcessStatus('tensorboard', status.processes.tensorboard);
-                
-                // Update system metrics
-                document.getElementById('system-metrics').textContent = status.system_metrics || 'Metrics unavailable';
-                
-            } catch (error) {
-                console.error('Failed to update status:', error);
+        function updateStatus(status) {
+            // Update process statuses
+            updateProcessStatus('training', status.processes.training);
+            updateProcessStatus('evaluation', status.processes.evaluation);
+            updateProcessStatus('api', status.processes.api);
+            updateProcessStatus('simulation', status.processes.simulation);
+            updateProcessStatus('tensorboard', status.processes.tensorboard);
+            
+            // Update system metrics
+            document.getElementById('system-metrics').textContent = status.system_metrics || 'Metrics unavailable';
+        }
+
+        function updateLogs(logs) {
+            for (const [name, delta] of Object.entries(logs)) {
+                const logsElement = document.getElementById(`${name}-logs`);
+                if (!logsElement) continue;
+                const text = delta.lines.length ? delta.lines.join('\\n') + '\\n' : '';
+                if (delta.reset) {
+                    logsElement.textContent = text;
+                    if (logsElement.firstChild) logsElement.firstChild.lineCount = delta.lines.length;
+                    logLineCounts[name] = delta.lines.length;
+                } else if (delta.lines.length) {
+                    const node = document.createTextNode(text);
+                    node.lineCount = delta.lines.length;
+                    logsElement.append(node);
+                    // Each text node holds one update's lines; drop the oldest lines past the cap
+                    let excess = (logLineCounts[name] || 0) + delta.lines.length - MAX_LOG_LINES;
+                    logLineCounts[name] = Math.min((logLineCounts[name] || 0) + delta.lines.length, MAX_LOG_LINES);
+                    while (excess > 0) {
+                        const first = logsElement.firstChild;
+                        if (first.lineCount <= excess) {
+                            excess -= first.lineCount;
+                            first.remove();
+                        } else {
+                            let cut = 0;
+                            for (let i = 0; i < excess; i++) cut = first.data.indexOf('\\n', cut) + 1;
+                            first.data = first.data.slice(cut);
+                            first.lineCount -= excess;
+                            excess = 0;
+                        }
+                    }
+                }
+                logsElement.scrollTop = logsElement.scrollHeight;
             }
         }
 
+        function connectEvents() {
+            // The server pushes status and logs whenever they change; EventSource reconnects on its own
+            if (events) return;
+            events = new EventSource('/api/events');
+            events.onmessage = event => {
+                const update = JSON.parse(event.data);
+                updateStatus(update.status);
+                updateLogs(update.logs);
+            };
+            events.onerror = () => {
+                // EventSource gives up for good on an error status (e.g. 503 when the server has too many
+                // streams open), so retry by hand
+                if (events && events.readyState === EventSource.CLOSED) {
+                    events = null;
+                    setTimeout(() => { if (document.visibilityState === 'visible') connectEvents(); }, 5000);
+                }
+            };
+        }
+
+        function disconnectEvents() {
+            if (!events) return;
+            events.close();
+            events = null;
+        }
+
+        // Background tabs drop their stream; a fresh one resends current status and full logs
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'visible') connectEvents();
+            else disconnectEvents();
+        });
+
         function updateProcessStatus(processName, status) {
-            const statusElement = document.getElementById(`${processName}-status`);
+            // The simulation tab's status line is sim-status; simulation-status is the environment card
+            const statusElement = document.getElementById(processName === 'simulation' ? 'sim-status' : `${processName}-status`);
             const startBtn = document.getElementById(`start-${processName === 'tensorboard' ? 'tb' : processName === 'evaluation' ? 'eval' : processName === 'simulation' ? 'sim' : processName}-btn`);
             const stopBtn = document.getElementById(`stop-${processName === 'tensorboard' ? 'tb' : processName === 'evaluation' ? 'eval' : processName === 'simulation' ? 'sim' : processName}-btn`);
             
@@ -385,9 +650,12 @@ class WebGUIHandler(SimpleHTTPRequestHandler):
             ).join('');
         }
 
-        async function checkEnvironment() {
-            // This would trigger environment check on the backend
-            console.log('Checking environment...');
+        async function checkEnvironment(refresh = true) {
+            const checks = await apiCall(`check_environment${refresh ? '?refresh=1' : ''}`);
+            for (const [name, check] of Object.entries(checks)) {
+                const element = document.getElementById(`${name}-status-text`);
+                if (element) element.textContent = `${check.ok ? '✅' : '❌'} ${check.detail}`;
+            }
         }
 
         function openSetupGuide() {
@@ -480,11 +748,21 @@ class WebGUIHandler(SimpleHTTPRequestHandler):
         }
 
         async function startTensorboard() {
+            // Open the tab while still handling the click, or popup blockers stop it; it is pointed at Tensorboard once that is up
+            const tab = window.open('', '_blank');
             const result = await apiCall('start_tensorboard', 'POST');
             if (result.success) {
                 document.getElementById('tensorboard-status').textContent = 'Tensorboard started on http://localhost:6006';
-                setTimeout(() => window.open('http://localhost:6006', '_blank'), 2000);
+                // The server answers as soon as Tensorboard accepts connections
+                let ready = false;
+                for (let attempt = 0; attempt < 2 && !ready; attempt++) {
+                    ready = (await apiCall('tensorboard_ready?wait=30')).ready;
+                }
+                if (!tab) return;
+                if (ready) tab.location = 'http://localhost:6006';
+                else tab.close();
             } else {
+                if (tab) tab.close();
                 alert(`Failed to start Tensorboard: ${result.error}`);
             }
         }
@@ -504,128 +782,757 @@ class WebGUIHandler(SimpleHTTPRequestHandler):
         document.addEventListener('DOMContentLoaded', function() {
             loadPresets();
             loadModels();
-            updateStatus();
-            statusUpdateInterval = setInterval(updateStatus, 5000);
+            checkEnvironment(false);
+            connectEvents();
         });
-    </script>
-</body>
-</html>
 """
-
-
-class OSRSWebGUI:
-    """Web-based GUI for OSRS PvP RL management."""
     
-    def __init__(self, port=8080):
-        self.port = port
-        self.project_root = Path(__file__).parent
-        self.pvp_ml_dir = self.project_root / "pvp-ml"
-        self.simulation_dir = self.project_root / "simulation-rsps" / "ElvargServer"
+    @staticmethod
+    def get_main_html():
+        """Generate the main HTML interface (asset version placeholders are filled in at import)."""
+        return """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>OSRS PvP Reinforcement Learning</title>
+    <link rel="stylesheet" href="/static/app.css?v=__APP_CSS_VERSION__">
+</head>
+<body>
+    <div class="container">
+        <h1>🗡️ OSRS PvP Reinforcement Learning</h1>
+        
+        <div class="tabs">
+            <button class="tab active" onclick="showTab('setup')">Setup & Status</button>
+            <button class="tab" onclick="showTab('training')">Training</button>
+            <button class="tab" onclick="showTab('evaluation')">Evaluation</button>
+            <button class="tab" onclick="showTab('monitoring')">Monitoring</button>
+            <button class="tab" onclick="showTab('api')">API Server</button>
+            <button class="tab" onclick="showTab('simulation')">Simulation</button>
+        </div>
+
+        <!-- Setup Tab -->
+        <div id="setup" class="tab-content active">
+            <div class="section">
+                <h3>Environment Status</h3>
+                <div id="status-grid" class="status-grid">
+                    <div class="status-item" id="conda-status">
+                        <h4>Conda Environment</h4>
+                        <div>Status: <span id="conda-status-text">Checking...</span></div>
+                    </div>
+                    <div class="status-item" id="python-status">
+                        <h4>Python Packages</h4>
+                        <div>Status: <span id="python-status-text">Checking...</span></div>
+                    </div>
+                    <div class="status-item" id="java-status">
+                        <h4>Java Runtime</h4>
+                        <div>Status: <span id="java-status-text">Checking...</span></div>
+                    </div>
+                    <div class="status-item" id="simulation-status">
+                        <h4>Simulation Server</h4>
+                        <div>Status: <span id="simulation-status-text">Checking...</span></div>
+                    </div>
+                </div>
+                <button class="btn btn-primary" onclick="checkEnvironment()">Check Environment</button>
+                <button class="btn btn-secondary" onclick="openSetupGuide()">Open Setup Guide</button>
+            </div>
+        </div>
+
+        <!-- Training Tab -->
+        <div id="training" class="tab-content">
+            <div class="section">
+                <h3>Training Configuration</h3>
+                <div class="form-group">
+                    <label for="preset-select">Training Preset:</label>
+                    <select id="preset-select">
+                        <option value="">Loading presets...</option>
+                    </select>
+                </div>
+                <div class="form-group">
+                    <label>
+                        <input type="checkbox" id="distributed-training"> Distributed Training
+                    </label>
+                </div>
+                <div class="form-group">
+                    <label for="workers-input">Parallel Workers:</label>
+                    <input type="text" id="workers-input" value="auto" placeholder="auto or number">
+                </div>
+                <div>
+                    <button class="btn btn-success" id="start-training-btn" onclick="startTraining()">Start Training</button>
+                    <button class="btn btn-danger" id="stop-training-btn" onclick="stopTraining()" disabled>Stop Training</button>
+                    <button class="btn btn-primary" onclick="openTensorboard()">View Progress</button>
+                </div>
+                <div id="training-status" style="margin-top: 15px; font-weight: bold;"></div>
+            </div>
+            <div class="section">
+                <h3>Training Logs</h3>
+                <div id="training-logs" class="logs"></div>
+            </div>
+        </div>
+
+        <!-- Evaluation Tab -->
+        <div id="evaluation" class="tab-content">
+            <div class="section">
+                <h3>Model Selection</h3>
+                <div class="form-group">
+                    <label for="model-select">Model:</label>
+                    <select id="model-select">
+                        <option value="">Loading models...</option>
+                    </select>
+                </div>
+                <div>
+                    <button class="btn btn-success" id="start-eval-btn" onclick="startEvaluation()">Start Evaluation</button>
+                    <button class="btn btn-danger" id="stop-eval-btn" onclick="stopEvaluation()" disabled>Stop Evaluation</button>
+                    <button class="btn btn-secondary" onclick="startSimulation()">Start Simulation</button>
+                </div>
+                <div id="evaluation-status" style="margin-top: 15px; font-weight: bold;"></div>
+            </div>
+            <div class="section">
+                <h3>Evaluation Logs</h3>
+                <div id="evaluation-logs" class="logs"></div>
+            </div>
+        </div>
+
+        <!-- Monitoring Tab -->
+        <div id="monitoring" class="tab-content">
+            <div class="section">
+                <h3>Tensorboard</h3>
+                <div>
+                    <button class="btn btn-success" id="start-tb-btn" onclick="startTensorboard()">Start Tensorboard</button>
+                    <button class="btn btn-danger" id="stop-tb-btn" onclick="stopTensorboard()" disabled>Stop Tensorboard</button>
+                    <button class="btn btn-primary" onclick="openTensorboard()">Open in Browser</button>
+                </div>
+                <div id="tensorboard-status" style="margin-top: 15px; font-weight: bold;"></div>
+            </div>
+            <div class="section">
+                <h3>System Metrics</h3>
+                <div id="system-metrics" class="metrics">Loading metrics...</div>
+            </div>
+        </div>
+
+        <!-- API Tab -->
+        <div id="api" class="tab-content">
+            <div class="section">
+                <h3>API Server Configuration</h3>
+                <div class="form-group">
+                    <label for="api-host">Host:</label>
+                    <input type="text" id="api-host" value="127.0.0.1">
+                </div>
+                <div class="form-group">
+                    <label for="api-port">Port:</label>
+                    <input type="text" id="api-port" value="9999">
+                </div>
+                <div>
+                    <button class="btn btn-success" id="start-api-btn" onclick="startApiServer()">Start API Server</button>
+                    <button class="btn btn-danger" id="stop-api-btn" onclick="stopApiServer()" disabled>Stop API Server</button>
+                </div>
+                <div id="api-status" style="margin-top: 15px; font-weight: bold;"></div>
+            </div>
+        </div>
+
+        <!-- Simulation Tab -->
+        <div id="simulation" class="tab-content">
+            <div class="section">
+                <h3>Simulation Server</h3>
+                <div>
+                    <button class="btn btn-success" id="start-sim-btn" onclick="startSimulation()">Start Simulation</button>
+                    <button class="btn btn-danger" id="stop-sim-btn" onclick="stopSimulation()" disabled>Stop Simulation</button>
+                </div>
+                <div id="sim-status" style="margin-top: 15px; font-weight: bold;"></div>
+                <div style="margin-top: 15px; padding: 15px; background: #e9ecef; border-radius: 5px;">
+                    <strong>Connection Info:</strong><br>
+                    Game Server: localhost:43595 (for RSPS clients)<br>
+                    RL API Server: localhost:43594 (for training/evaluation)
+                </div>
+            </div>
+            <div class="section">
+                <h3>Simulation Logs</h3>
+                <div id="simulation-logs" class="logs"></div>
+            </div>
+        </div>
+    </div>
+
+    <script src="/static/app.js?v=__APP_JS_VERSION__"></script>
+</body>
+</html>
+"""
+
+
+def _precompress(text: str) -> Tuple[bytes, bytes, str]:
+    """Encode text, gzip it and compute its ETag: (body, gzipped body, etag)."""
+    body = text.encode('utf-8')
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    return body, gzip.compress(body, compresslevel=9, mtime=0), f'"{digest}"'
+
+
+# The page and its assets are static, so encode and compress them once at import
+_STATIC = {
+    '/static/app.css': (*_precompress(WebGUIHandler.get_main_css()), 'text/css; charset=utf-8'),
+    '/static/app.js': (*_precompress(WebGUIHandler.get_main_js()), 'text/javascript; charset=utf-8'),
+}
+_MAIN_HTML, _MAIN_HTML_GZ, _MAIN_HTML_ETAG = _precompress(
+    WebGUIHandler.get_main_html()
+    .replace('__APP_CSS_VERSION__', _STATIC['/static/app.css'][2][1:9])
+    .replace('__APP_JS_VERSION__', _STATIC['/static/app.js'][2][1:9])
+)
+
+
+# Reports missing modules and the Java banner as JSON; one line, so `conda run` accepts it
+_ENV_PROBE_SCRIPT = (
+    "import importlib.util, json, shutil, subprocess; "
+    "modules = {m: None if importlib.util.find_spec(m) else 'not installed' for m in ('pvp_ml', 'torch')}; "
+    "java = subprocess.run(['java', '-version'], capture_output=True, text=True) if shutil.which('java') else None; "
+    "print(json.dumps({'modules': modules, 'java': java and java.returncode == 0 and (java.stderr or java.stdout).strip().splitlines()[0]}))"
+)
+
+
+# Processes whose output is shown in the page's log panes
+LOG_PANES = ('training', 'evaluation', 'simulation')
+
+# Every process the GUI manages, as reported by the status endpoint
+PROCESS_NAMES = ('training', 'evaluation', 'api', 'simulation', 'tensorboard')
+
+
+class OSRSWebGUI:
+    """Web-based GUI for OSRS PvP RL management."""
+    
+    def __init__(self, port=8080, project_root: Optional[Path] = None):
+        self.port = port
+        self.project_root = project_root or Path(__file__).resolve().parent
+        self.pvp_ml_dir = self.project_root / "pvp-ml"
+        self.simulation_dir = self.project_root / "simulation-rsps" / "ElvargServer"
         self.config_dir = self.pvp_ml_dir / "config"
         self.models_dir = self.pvp_ml_dir / "models"
         self.conda_env_path = self.pvp_ml_dir / "env"
+        self._conda_env_str = str(self.conda_env_path)
+        self._conda_env_history = os.path.join(self._conda_env_str, "conda-meta", "history")
+        self._conda_environ: Optional[Tuple[float, Dict[str, str]]] = None
+        self._conda_environ_lock = threading.Lock()
+        # Environment for commands when there is no conda env
+        self._base_environ: Dict[str, str] = dict(os.environ)
         
         # Process tracking
         self.processes: Dict[str, subprocess.Popen] = {}
+        self.log_queues: Dict[str, LogBuffer] = {}
+        # Whether each tracked process is alive, updated by its exit notification
+        self.running: Dict[str, bool] = {}
+        self._start_lock = threading.Lock()
+        
+        # One thread multiplexes every process's output; selectors can't watch pipes on Windows
+        self._selector = selectors.DefaultSelector() if os.name != 'nt' else None
+        # Only epoll/kqueue see fds registered mid-select, so other selectors wake periodically
+        live_registration = tuple(
+            getattr(selectors, name) for name in ('EpollSelector', 'KqueueSelector') if hasattr(selectors, name)
+        )
+        self._select_timeout = None if isinstance(self._selector, live_registration) else 0.5
+        self._log_pump: Optional[threading.Thread] = None
+        
+        # Bumped whenever process state or logs change, for event stream listeners
+        self._changed = threading.Condition()
+        self._change_version = 0
+        self.closing = threading.Event()
+        
+        # Encoded JSON for idempotent endpoints, keyed by endpoint: (timestamp, body)
+        self._json_cache: Dict[str, Tuple[float, bytes]] = {}
+        # One lock per key, so concurrent misses wait for a single producer run instead of each running it
+        self._json_cache_locks: Dict[str, threading.Lock] = {}
+        
+        self.tensorboard_ready = threading.Event()
+        
+        # Last (timestamp, (CPU %, memory %)) sample; priming cpu_percent makes the first real sample meaningful
+        self._system_metrics: Tuple[float, Tuple[float, float]] = (float('-inf'), (0.0, 0.0))
+        if psutil is not None:
+            psutil.cpu_percent(interval=None)
+        
+        # Preset names per config file: path -> ((mtime_ns, size), names)
+        self._preset_files: Dict[str, Tuple[Tuple[int, int], List[str]]] = {}
+        # Encoded preset list, keyed by the (path, (mtime_ns, size)) of every config file it was built from
+        self._presets_json: Optional[Tuple[List[Tuple[str, Tuple[int, int]]], bytes]] = None
+        # Encoded status, keyed by everything it is built from (see get_status_json)
+        self._status_json: Optional[Tuple[Tuple, bytes]] = None
+        # Encoded model list, keyed by the models directory's mtime_ns (None if it doesn't exist)
+        self._models_json: Optional[Tuple[Optional[int], bytes]] = None
+        
+    def is_running(self, name: str) -> bool:
+        """Check whether the named process is alive."""
+        return self.running.get(name, False)
+        
+    def has_conda_env(self) -> bool:
+        """Check whether the pvp-ml conda environment has been created."""
+        # conda writes conda-meta/history into every environment it creates, as setup.py relies on too
+        try:
+            return stat.S_ISREG(os.stat(self._conda_env_history).st_mode)
+        except OSError:
+            return False
         
-    def run_command(self, command: List[str], cwd: Optional[Path] = None, env_vars: Optional[Dict] = None) -> subprocess.Popen:
-        """Run a command in the conda environment."""
-        # Use conda environment if available
-        if self.conda_env_path.exists():
-            conda_cmd = ["conda", "run", "-p", str(self.conda_env_path)] + command
+    def conda_environ(self) -> Optional[Dict[str, str]]:
+        """Get the environment variables of the activated conda env, captured once per env mtime."""
+        if not self.has_conda_env():
+            return None
+        mtime = os.stat(self._conda_env_str).st_mtime
+        with self._conda_environ_lock:
+            return self._capture_conda_environ(mtime)
+    
+    def _capture_conda_environ(self, mtime: float) -> Optional[Dict[str, str]]:
+        if self._conda_environ is None or self._conda_environ[0] != mtime:
+            try:
+                result = subprocess.run(
+                    ["conda", "run", "-p", self._conda_env_str, "python", "-c",
+                     "import os, json; print(json.dumps(dict(os.environ)))"],
+                    capture_output=True, text=True, check=True, timeout=120
+                )
+                environ = loads_json(result.stdout.strip().splitlines()[-1])
+            except (OSError, subprocess.SubprocessError, ValueError, IndexError):
+                # conda itself is unavailable or broken; remember an approximation rather than retrying every call
+                environ = self._approximate_conda_environ()
+            self._conda_environ = (mtime, environ)
+        return self._conda_environ[1]
+    
+    def _approximate_conda_environ(self) -> Dict[str, str]:
+        """Activate the env by hand (PATH and CONDA_PREFIX only, no activate.d hooks)."""
+        if os.name == 'nt':
+            subdirs = ("", "Library\\mingw-w64\\bin", "Library\\usr\\bin", "Library\\bin", "Scripts", "bin")
         else:
-            conda_cmd = command
-            
-        env = os.environ.copy()
+            subdirs = ("bin",)
+        bin_dirs = [os.path.join(self._conda_env_str, subdir) for subdir in subdirs]
+        environ = dict(self._base_environ)
+        environ['PATH'] = os.pathsep.join(bin_dirs + [environ.get('PATH', '')])
+        environ['CONDA_PREFIX'] = self._conda_env_str
+        return environ
+        
+    def resolve_command(
+        self, command: List[str], env_vars: Optional[Dict] = None
+    ) -> Tuple[List[str], Dict[str, str]]:
+        """Get the argv and environment that run command inside the conda environment."""
+        # Spawn directly with the env's activated variables rather than paying for `conda run` each time
+        conda_environ = self.conda_environ()
+        # Popen only reads env, so the shared dict is only copied when adding variables
+        env = conda_environ or self._base_environ
         if env_vars:
-            env.update(env_vars)
+            env = {**env, **env_vars}
             
+        executable = shutil.which(command[0], path=env.get('PATH'))
+        if executable is not None:
+            conda_cmd = [executable] + command[1:]
+        elif conda_environ is not None:
+            conda_cmd = ["conda", "run", "--no-capture-output", "-p", self._conda_env_str] + command
+        else:
+            conda_cmd = command
+        return conda_cmd, env
+        
+    def run_command(self, command: List[str], cwd: Optional[Path] = None, env_vars: Optional[Dict] = None,
+                    capture: bool = True) -> subprocess.Popen:
+        """Run a command in the conda environment, discarding its output unless capture is set."""
+        conda_cmd, env = self.resolve_command(command, env_vars)
         return subprocess.Popen(
             conda_cmd,
             cwd=cwd or self.project_root,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            env=env
+            stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+            env=env,
+            close_fds=INHERIT_SAFE_CLOSE_FDS,
+            # Own process group, so stopping it reaches its children too (see _terminate_group)
+            start_new_session=True
         )
     
-    def get_status(self):
-        """Get current system status."""
-        status = {
-            'processes': {},
-            'system_metrics': 'CPU: N/A | Memory: N/A | Processes: N/A'
-        }
-        
-        # Check process statuses
-        for name in ['training', 'evaluation', 'api', 'simulation', 'tensorboard']:
-            if name in self.processes and self.processes[name].poll() is None:
-                status['processes'][name] = {'running': True, 'status': 'Running'}
+    def track_process(self, name: str, process: subprocess.Popen):
+        """Register a started process and start collecting its output."""
+        self.processes[name] = process
+        self.running[name] = True
+        queue = self.log_queues.setdefault(name, LogBuffer())
+        if process.stdout is None:
+            # Output discarded: only its exit needs watching
+            if self._selector is None:
+                self._watch_exit_with_thread(name, process)
             else:
-                status['processes'][name] = {'running': False, 'status': 'Stopped'}
-                
-        # Try to get system metrics
+                self._watch_exit(name, process)
+            self.notify_change()
+            return
+        if fcntl is not None and hasattr(fcntl, 'F_SETPIPE_SZ'):
+            try:
+                fcntl.fcntl(process.stdout.fileno(), fcntl.F_SETPIPE_SZ, PIPE_SIZE)
+            except OSError:
+                pass  # Above the system's pipe-max-size; keep the default
+        # (queue, incomplete last line, set once the pipe reaches EOF)
+        output = (queue, bytearray(), threading.Event())
+        if self._selector is None:
+            threading.Thread(
+                target=self.log_reader, args=(process.stdout, *output), name=f"log-{name}", daemon=True
+            ).start()
+            self._watch_exit_with_thread(name, process, output)
+            self.notify_change()
+            return
+        os.set_blocking(process.stdout.fileno(), False)
+        self._selector.register(process.stdout, selectors.EVENT_READ, data=('log', *output))
+        self._watch_exit(name, process, output)
+        self.notify_change()
+    
+    def _watch_exit(self, name: str, process: subprocess.Popen, output: Optional[Tuple] = None):
+        """Have the log pump report the process's exit, after any output it left in the pipe."""
+        # A pidfd becomes readable exactly once, when the process exits (Linux 5.3+)
         try:
-            import psutil
-            cpu = psutil.cpu_percent(interval=None)
-            memory = psutil.virtual_memory()
-            status['system_metrics'] = f"CPU: {cpu:.1f}% | Memory: {memory.percent:.1f}% | Active: {len([p for p in self.processes.values() if p.poll() is None])}"
-        except ImportError:
-            pass
+            pidfd = os.pidfd_open(process.pid)
+        except (AttributeError, OSError):
+            self._watch_exit_with_thread(name, process, output)
+        else:
+            self._selector.register(pidfd, selectors.EVENT_READ, data=('exit', name, process, output))
+        if self._log_pump is None:
+            self._log_pump = threading.Thread(target=self.pump_logs, name="log-pump", daemon=True)
+            self._log_pump.start()
+    
+    def notify_change(self):
+        """Wake event stream listeners."""
+        with self._changed:
+            self._change_version += 1
+            self._changed.notify_all()
+    
+    def wait_for_change(self, version: Optional[int], timeout: float) -> int:
+        """Block until something changes after version (or timeout), returning the new version."""
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self._change_version != version or self.closing.is_set(), timeout
+            )
+            return self._change_version
+    
+    def wait_for_exit(self, name: str, timeout: float) -> bool:
+        """Block until the named process has been seen to exit, returning False on timeout."""
+        with self._changed:
+            return self._changed.wait_for(lambda: not self.running.get(name), timeout)
+    
+    def pump_logs(self):
+        """Read whatever output is available from all tracked processes, forever."""
+        while True:
+            events = self._selector.select(timeout=self._select_timeout)
+            for key, _ in events:
+                if key.data[0] == 'exit':
+                    _, name, process, output = key.data
+                    self._selector.unregister(key.fd)
+                    os.close(key.fd)
+                    # Log whatever it wrote before exiting ahead of the exit line
+                    if output is not None and not output[2].is_set():
+                        self.read_output(process.stdout, *output, limit=PIPE_SIZE)
+                    self.on_process_exit(name, process)
+                    continue
+                self.read_output(key.fileobj, *key.data[1:])
+            if events:
+                self.notify_change()
+    
+    def read_output(
+        self, stream, queue: LogBuffer, pending: bytearray, eof: threading.Event, limit: int = 65536
+    ):
+        """Read from a non-blocking pipe into queue until it is empty or about limit bytes have been read."""
+        total = 0
+        while total < limit:
+            try:
+                chunk = os.read(stream.fileno(), 65536)
+            except BlockingIOError:
+                return
+            if not chunk:
+                self._selector.unregister(stream)
+                stream.close()
+                eof.set()
+            self.append_output(queue, pending, chunk)
+            if not chunk:
+                return
+            total += len(chunk)
+    
+    def _watch_exit_with_thread(self, name: str, process: subprocess.Popen, output: Optional[Tuple] = None):
+        """Fallback exit notification for platforms without pidfd support."""
+        def wait():
+            process.wait()
+            if output is not None:
+                # Let the reader catch up, unless something the process spawned is holding the pipe open
+                output[2].wait(timeout=2)
+            self.on_process_exit(name, process)
+        threading.Thread(target=wait, name=f"wait-{name}", daemon=True).start()
+    
+    def on_process_exit(self, name: str, process: subprocess.Popen):
+        """Reap an exited process and record how it ended."""
+        returncode = process.wait()
+        if self.processes.get(name) is process:
+            self.running[name] = False
+        self.log_queues[name].append(f"[process exited with code {returncode}]")
+        self.notify_change()
+    
+    @staticmethod
+    def append_output(queue: LogBuffer, pending: bytearray, chunk: bytes):
+        """Add a raw chunk of output to queue, holding back an incomplete last line (flushed on EOF)."""
+        if not chunk:
+            if pending:
+                queue.append(pending.decode('utf-8', 'replace').rstrip())
+                pending.clear()
+            return
+        pending.extend(chunk)
+        lines = pending.split(b'\n')
+        pending[:] = lines.pop()
+        queue.extend(line.decode('utf-8', 'replace').rstrip() for line in lines)
+    
+    def log_reader(self, stream, queue: LogBuffer, pending: bytearray, eof: threading.Event):
+        """Drain a process's output into its bounded log queue."""
+        with stream:
+            fd = stream.fileno()
+            while True:
+                # Blocking reads of whatever is available, split into lines in bulk
+                chunk = os.read(fd, 65536)
+                self.append_output(queue, pending, chunk)
+                self.notify_change()
+                if not chunk:
+                    break
+        eof.set()
+    
+    def cached_json(self, key: str, producer: Callable[[], Any], ttl: float = 5.0) -> bytes:
+        """Get the encoded JSON result of producer, reusing it for up to ttl seconds."""
+        entry = self._json_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        with self._json_cache_locks.setdefault(key, threading.Lock()):
+            # Another request may have produced it while we waited
+            entry = self._json_cache.get(key)
+            now = time.monotonic()
+            if entry is not None and now - entry[0] < ttl:
+                return entry[1]
+            body = dumps_json(producer())
+            self._json_cache[key] = (now, body)
+            return body
+    
+    def invalidate_json_cache(self, *keys: str):
+        """Drop cached JSON for the given endpoints, or all of them if none are given."""
+        if not keys:
+            self._json_cache.clear()
+        for key in keys:
+            self._json_cache.pop(key, None)
+    
+    def check_environment(self) -> Dict[str, Dict[str, Any]]:
+        """Check each part of the installation, keyed by component: {'ok': bool, 'detail': str}."""
+        checks = (self._check_conda, self._check_python_and_java, self._check_simulation)
+        status: Dict[str, Dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            for result in executor.map(lambda check: check(), checks):
+                status.update(result)
+        return status
+    
+    def _run_probe(self, command: List[str]) -> Optional[subprocess.CompletedProcess]:
+        """Run a short check command in the conda environment, or None if it couldn't be run."""
+        argv, env = self.resolve_command(command)
+        try:
+            return subprocess.run(
+                argv, env=env, stdin=subprocess.DEVNULL, close_fds=INHERIT_SAFE_CLOSE_FDS,
+                capture_output=True, text=True, timeout=120
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+    
+    def _check_conda(self) -> Dict[str, Dict[str, Any]]:
+        if self.has_conda_env():
+            return {'conda': {'ok': True, 'detail': f"Found at {self.conda_env_path.relative_to(self.project_root)}"}}
+        return {'conda': {'ok': False, 'detail': "Not found - run ./launch.sh setup"}}
+    
+    def _check_python_and_java(self) -> Dict[str, Dict[str, Any]]:
+        """Check the packages and Java from one interpreter in the env, saving a process launch."""
+        if not self.has_conda_env():
+            missing = {'ok': False, 'detail': "Conda environment missing"}
+            return {'python': missing, 'java': missing}
+        result = self._run_probe(["python", "-c", _ENV_PROBE_SCRIPT])
+        try:
+            probe = loads_json(result.stdout.strip().splitlines()[-1])
+        except (AttributeError, ValueError, IndexError):
+            failed = {'ok': False, 'detail': "Could not run Python in the environment"}
+            return {'python': failed, 'java': failed}
+        
+        errors = {module: error for module, error in probe['modules'].items() if error}
+        python = (
+            {'ok': False, 'detail': "; ".join(f"{module}: {error}" for module, error in errors.items())}
+            if errors else {'ok': True, 'detail': "pvp_ml and torch installed"}
+        )
+        java = {'ok': True, 'detail': probe['java']} if probe['java'] else {'ok': False, 'detail': "Java not found"}
+        return {'python': python, 'java': java}
+    
+    def _check_simulation(self) -> Dict[str, Dict[str, Any]]:
+        if not (self.simulation_dir / "gradlew").exists():
+            return {'simulation': {'ok': False, 'detail': "Gradle wrapper not found"}}
+        return {'simulation': {'ok': True, 'detail': "Gradle wrapper found"}}
+    
+    def running_snapshot(self) -> Tuple[bool, ...]:
+        """Get whether each of PROCESS_NAMES is running."""
+        return tuple(self.running.get(name, False) for name in PROCESS_NAMES)
+    
+    def get_status(self, running: Optional[Tuple[bool, ...]] = None,
+                   metrics: Optional[Tuple[float, float]] = None):
+        """Get current system status, optionally from an already taken running_snapshot and metrics sample."""
+        if running is None:
+            running = self.running_snapshot()
+        if metrics is None:
+            metrics = self.system_metrics()
+        status = {
+            'processes': {
+                name: {'running': True, 'status': 'Running'} if is_running else {'running': False, 'status': 'Stopped'}
+                for name, is_running in zip(PROCESS_NAMES, running)
+            },
+            'system_metrics': f"CPU: N/A | Memory: N/A | Active: {sum(running)}"
+        }
+        if metrics is not None:
+            cpu, memory = metrics
+            status['system_metrics'] = f"CPU: {cpu:.1f}% | Memory: {memory:.1f}% | Active: {sum(running)}"
             
         return status
     
-    def get_presets(self):
-        """Get available training presets."""
-        presets = []
-        if self.config_dir.exists():
-            for yaml_file in self.config_dir.glob("*.yml"):
-                try:
-                    with open(yaml_file, 'r') as f:
-                        config_data = yaml.safe_load(f)
-                        if isinstance(config_data, dict):
-                            presets.extend(config_data.keys())
-                except Exception:
-                    pass
-        return sorted(presets)
+    def system_metrics(self) -> Optional[Tuple[float, float]]:
+        """Get (CPU %, memory %), sampling /proc at most once a second however often status is requested."""
+        if psutil is None:
+            return None
+        now = time.monotonic()
+        sampled_at, metrics = self._system_metrics
+        if now - sampled_at >= 1.0:
+            metrics = (psutil.cpu_percent(interval=None), psutil.virtual_memory().percent)
+            self._system_metrics = (now, metrics)
+        return metrics
+    
+    def get_status_json(self) -> bytes:
+        """Get the encoded status, re-encoding only when a process starts or stops or metrics are resampled."""
+        key = (self.running_snapshot(), self.system_metrics())
+        cached = self._status_json
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        # Built from the same snapshot it is keyed on, so a concurrent start or stop can't be cached under the wrong key
+        body = dumps_json(self.get_status(*key))
+        self._status_json = (key, body)
+        return body
+    
+    def get_presets(self, files: Optional[List[Tuple[str, Tuple[int, int]]]] = None) -> List[str]:
+        """Get available training presets (top-level keys of every .yml under config/, as `train` loads them)."""
+        if files is None:
+            files = self._preset_file_versions()
+        return sorted(name for path, version in files for name in self._preset_names(path, version))
+    
+    def get_presets_json(self) -> bytes:
+        """Get the encoded preset list, rebuilding it only when a config file is added, removed or changed."""
+        files = self._preset_file_versions()
+        cached = self._presets_json
+        if cached is not None and cached[0] == files:
+            return cached[1]
+        body = dumps_json(self.get_presets(files))
+        self._presets_json = (files, body)
+        return body
+    
+    def _preset_file_versions(self) -> List[Tuple[str, Tuple[int, int]]]:
+        """List (path, (mtime_ns, size)) of every preset file under the config directory."""
+        files = []
+        pending = [str(self.config_dir)]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.name.endswith(".yml"):
+                            try:
+                                st = entry.stat()
+                            except OSError:
+                                continue
+                            files.append((entry.path, (st.st_mtime_ns, st.st_size)))
+            except OSError:
+                continue
+        return sorted(files)
+    
+    def _preset_names(self, path: str, version: Tuple[int, int]) -> List[str]:
+        """Get the presets defined in a config file, only re-parsing it when it changes."""
+        cached = self._preset_files.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+            # Presets are the file's top-level keys, so a line scan finds them without building the document
+            names = [match.decode('utf-8') for match in PRESET_KEY.findall(content)]
+            if not names:
+                # Unusual layout (quoted or flow-style keys): let the YAML parser decide
+                config_data = yaml.load(content, Loader=YAML_LOADER)
+                names = list(config_data.keys()) if isinstance(config_data, dict) else []
+        except Exception:
+            names = []
+        self._preset_files[path] = (version, names)
+        return names
     
     def get_models(self):
-        """Get available models."""
-        models = []
-        if self.models_dir.exists():
-            for model_dir in self.models_dir.iterdir():
-                if model_dir.is_dir():
-                    models.append(f"models/{model_dir.name}")
-        return sorted(models)
+        """Get available models, as paths `eval` can load from the project root."""
+        prefix = self.models_dir.relative_to(self.project_root).as_posix()
+        try:
+            with os.scandir(self.models_dir) as entries:
+                return sorted(
+                    f"{prefix}/{entry.name}" for entry in entries
+                    if entry.name.endswith(".zip") and entry.is_file(follow_symlinks=False)
+                )
+        except OSError:
+            return []
+    
+    def get_models_json(self) -> bytes:
+        """Get the encoded model list, rescanning only when a file is added to or removed from the models directory."""
+        try:
+            version = os.stat(self.models_dir).st_mtime_ns
+        except OSError:
+            version = None
+        cached = self._models_json
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        body = dumps_json(self.get_models())
+        self._models_json = (version, body)
+        return body
     
     def get_logs(self, log_type):
         """Get logs for a specific process."""
-        if log_type in self.processes:
-            process = self.processes[log_type]
+        queue = self.log_queues.get(log_type)
+        if not queue:
+            return "No logs available"
+        return queue.text()
+    
+    def get_log_delta(self, log_type: str, since: Optional[int]) -> Tuple[int, bool, List[bytes]]:
+        """Get the encoded log lines of a process from cursor since onwards (see LogBuffer.since)."""
+        queue = self.log_queues.get(log_type)
+        if queue is None:
+            return 0, since is None or since > 0, []
+        return queue.since(since)
+    
+    def get_log_batch(self, cursors: Dict[str, Optional[int]]) -> bytes:
+        """Get the encoded log deltas of several processes, keyed by name."""
+        return b'{%s}' % b','.join(
+            dumps_json(name) + b':' + encode_log_delta(*self.get_log_delta(name, since))
+            for name, since in cursors.items()
+        )
+    
+    def get_events(self, cursors: Dict[str, int]) -> bytes:
+        """Get the encoded payload pushed to an event stream listener, advancing its log cursors."""
+        logs = []
+        for name in LOG_PANES:
+            next_seq, reset, fragments = self.get_log_delta(name, cursors.get(name))
+            cursors[name] = next_seq
+            if fragments or reset:
+                logs.append(dumps_json(name) + b':' + encode_log_delta(next_seq, reset, fragments))
+        return b'{"status":%s,"logs":{%s}}' % (self.get_status_json(), b','.join(logs))
+    
+    def _start(self, name: str, label: str, launch: Callable[[], subprocess.Popen]) -> Dict[str, Any]:
+        """Launch and track a process unless it is already running; shared by every start_* action."""
+        # Held across the check and the launch so two concurrent requests can't both start the process
+        with self._start_lock:
+            if self.is_running(name):
+                return {'success': False, 'error': f'{label} already running'}
             try:
-                stdout, stderr = process.communicate(timeout=0.1)
-                return f"{stdout}\n{stderr}".strip()
-            except subprocess.TimeoutExpired:
-                return "Process running..."
-        return "No logs available"
+                self.track_process(name, launch())
+            except Exception as e:
+                return {'success': False, 'error': str(e)}
+        return {'success': True}
     
     def start_training(self, config):
         """Start a training job."""
-        try:
-            if 'training' in self.processes and self.processes['training'].poll() is None:
-                return {'success': False, 'error': 'Training already running'}
-            
+        def launch():
             command = ["train", "--preset", config['preset']]
             if config.get('distributed'):
                 command.append("--distribute")
                 if config.get('workers', '').strip() and config['workers'] != 'auto':
                     command.append(config['workers'])
-                    
-            process = self.run_command(command)
-            self.processes['training'] = process
-            
-            return {'success': True}
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+            return self.run_command(command)
+        return self._start('training', 'Training', launch)
     
     def stop_training(self):
         """Stop training."""
@@ -633,17 +1540,9 @@ class OSRSWebGUI:
     
     def start_evaluation(self, config):
         """Start model evaluation."""
-        try:
-            if 'evaluation' in self.processes and self.processes['evaluation'].poll() is None:
-                return {'success': False, 'error': 'Evaluation already running'}
-            
-            command = ["eval", "--model-path", config['model']]
-            process = self.run_command(command)
-            self.processes['evaluation'] = process
-            
-            return {'success': True}
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+        return self._start(
+            'evaluation', 'Evaluation', lambda: self.run_command(["eval", "--model-path", config['model']])
+        )
     
     def stop_evaluation(self):
         """Stop evaluation."""
@@ -651,17 +1550,10 @@ class OSRSWebGUI:
     
     def start_api_server(self, config):
         """Start API server."""
-        try:
-            if 'api' in self.processes and self.processes['api'].poll() is None:
-                return {'success': False, 'error': 'API server already running'}
-            
-            command = ["serve-api", "--host", config['host'], "--port", config['port']]
-            process = self.run_command(command)
-            self.processes['api'] = process
-            
-            return {'success': True}
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+        # No log pane shows the API server's output
+        return self._start('api', 'API server', lambda: self.run_command(
+            ["serve-api", "--host", config['host'], "--port", config['port']], capture=False
+        ))
     
     def stop_api_server(self):
         """Stop API server."""
@@ -669,27 +1561,22 @@ class OSRSWebGUI:
     
     def start_simulation(self):
         """Start simulation server."""
-        try:
-            if 'simulation' in self.processes and self.processes['simulation'].poll() is None:
-                return {'success': False, 'error': 'Simulation already running'}
-            
-            gradlew = self.simulation_dir / "gradlew"
-            if not gradlew.exists():
-                return {'success': False, 'error': 'Gradle wrapper not found'}
-                
+        gradlew = self.simulation_dir / "gradlew"
+        if not gradlew.exists():
+            return {'success': False, 'error': 'Gradle wrapper not found'}
+        
+        def launch():
             os.chmod(gradlew, 0o755)
-            process = subprocess.Popen(
+            return subprocess.Popen(
                 ["./gradlew", "run"],
                 cwd=self.simulation_dir,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+                stderr=subprocess.STDOUT,
+                bufsize=0,
+                close_fds=INHERIT_SAFE_CLOSE_FDS,
+                start_new_session=True
             )
-            self.processes['simulation'] = process
-            
-            return {'success': True}
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+        return self._start('simulation', 'Simulation', launch)
     
     def stop_simulation(self):
         """Stop simulation."""
@@ -697,42 +1584,112 @@ class OSRSWebGUI:
     
     def start_tensorboard(self):
         """Start Tensorboard."""
-        try:
-            if 'tensorboard' in self.processes and self.processes['tensorboard'].poll() is None:
-                return {'success': False, 'error': 'Tensorboard already running'}
-            
-            command = ["train", "tensorboard"]
-            process = self.run_command(command)
-            self.processes['tensorboard'] = process
-            
-            return {'success': True}
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+        def launch():
+            self.tensorboard_ready.clear()
+            # No log pane shows Tensorboard's output; readiness comes from the port probe
+            return self.run_command(["train", "tensorboard"], capture=False)
+        result = self._start('tensorboard', 'Tensorboard', launch)
+        if result['success']:
+            threading.Thread(
+                target=self._probe_tensorboard, args=(self.processes.get('tensorboard'),),
+                name="tensorboard-probe", daemon=True
+            ).start()
+        return result
+    
+    def _probe_tensorboard(self, process: Optional[subprocess.Popen], port: int = 6006, timeout: float = 60.0):
+        """Set tensorboard_ready once Tensorboard accepts connections, unless it is stopped first."""
+        # `train tensorboard` detaches Tensorboard and exits, so its launcher exiting proves nothing
+        deadline = time.monotonic() + timeout
+        while process is not None and self.processes.get('tensorboard') is process and not self.closing.is_set():
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            except OSError:
+                if time.monotonic() >= deadline:
+                    return
+                time.sleep(0.1)
+                continue
+            self.tensorboard_ready.set()
+            return
     
     def stop_tensorboard(self):
         """Stop Tensorboard."""
+        self.tensorboard_ready.clear()
         return self.stop_process('tensorboard')
     
-    def stop_process(self, name):
-        """Stop a process by name."""
+    def stop_process(self, name, timeout: float = 5.0):
+        """Stop a process by name, killing it if it hasn't exited within timeout seconds."""
         try:
-            if name in self.processes:
-                process = self.processes[name]
-                if process.poll() is None:
-                    process.terminate()
-                    try:
-                        process.wait(timeout=5)
-                    except subprocess.TimeoutExpired:
-                        process.kill()
-                del self.processes[name]
+            process = self.processes.get(name)
+            if process is not None:
+                # Even if it has exited, what it spawned may still be running in its group
+                self._terminate_group(process)
+                if not self._wait_for_group(name, process, timeout):
+                    self._terminate_group(process, force=True)
+                # Once it has exited, a start request may already have replaced it; leave that one alone
+                with self._start_lock:
+                    if self.processes.get(name) is process:
+                        del self.processes[name]
+                        self.running.pop(name, None)
+                self.notify_change()
             return {'success': True}
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    def _wait_for_group(self, name: str, process: subprocess.Popen, timeout: float) -> bool:
+        """Block until the process and everything left in its group have exited, returning False on timeout."""
+        deadline = time.monotonic() + timeout
+        if process.returncode is None and not self.wait_for_exit(name, timeout=timeout):
+            return False
+        while self._group_alive(process):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+    
+    @staticmethod
+    def _group_alive(process: subprocess.Popen) -> bool:
+        """Check whether anything in the process's group is still running."""
+        if os.name == 'nt':
+            return process.returncode is None
+        # The group outlives its leader for as long as any descendant remains in it
+        try:
+            os.killpg(process.pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+    
+    @staticmethod
+    def _terminate_group(process: subprocess.Popen, force: bool = False):
+        """Signal the process and everything it spawned (Ray workers, the Gradle daemon's app JVM, ...)."""
+        if os.name == 'nt':
+            process.kill() if force else process.terminate()
+            return
+        # Launched with start_new_session, so the process leads a group of its own descendants
+        try:
+            os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    
     def cleanup(self):
         """Clean up all processes."""
+        self.closing.set()
+        self.notify_change()
+        # Ask everything to exit at once so their shutdowns overlap, rather than up to 5 s each in turn
+        for process in list(self.processes.values()):
+            self._terminate_group(process)
+        # One grace period shared by all of them, so shutdown takes at most ~5 s however many ignore SIGTERM
+        deadline = time.monotonic() + 5
         for name in list(self.processes.keys()):
-            self.stop_process(name)
+            self.stop_process(name, timeout=max(0.0, deadline - time.monotonic()))
+    
+    @staticmethod
+    def _open_browser(url: str):
+        try:
+            webbrowser.open(url)
+        except Exception:
+            pass  # Browser might not be available
     
     def run(self):
         """Run the web GUI."""
@@ -742,44 +1699,61 @@ class OSRSWebGUI:
         def handler_factory(*args, **kwargs):
             return WebGUIHandler(*args, gui_app=self, **kwargs)
         
+        # Started processes lead their own sessions, so a closed terminal or kill only reaches them through cleanup
+        stop_signals = [getattr(signal, name) for name in ('SIGHUP', 'SIGTERM') if hasattr(signal, name)]
+        def interrupt(signum, frame):
+            for stop_signal in stop_signals:
+                signal.signal(stop_signal, signal.SIG_IGN)
+            raise KeyboardInterrupt
+        if threading.current_thread() is threading.main_thread():
+            for stop_signal in stop_signals:
+                signal.signal(stop_signal, interrupt)
+        
         try:
-            with HTTPServer(("", self.port), handler_factory) as httpd:
+            with PooledHTTPServer(("", self.port), handler_factory) as httpd:
                 print(f"✅ Server running at http://localhost:{self.port}")
                 print("🎯 Open your browser to the URL above to use the GUI")
                 print("📖 Press Ctrl+C to stop the server")
                 
-                # Try to open browser automatically
-                try:
-                    webbrowser.open(f"http://localhost:{self.port}")
-                except Exception:
-                    pass  # Browser might not be available
+                # Try to open browser automatically, without holding up serving while it starts
+                threading.Thread(
+                    target=self._open_browser, args=(f"http://localhost:{self.port}",),
+                    name="open-browser", daemon=True
+                ).start()
                 
-                httpd.serve_forever()
+                try:
+                    httpd.serve_forever()
+                except KeyboardInterrupt:
+                    try:
+                        print("\n🛑 Shutting down...")
+                    except OSError:
+                        pass  # No terminal left to print to after a hangup
+                    # Ends event streams before the server closes their connections
+                    self.cleanup()
                 
-        except KeyboardInterrupt:
-            print("\n🛑 Shutting down...")
-            self.cleanup()
         except Exception as e:
             print(f"❌ Server error: {e}")
 
 
-def main():
+PARSER = argparse.ArgumentParser(description="OSRS PvP RL Web GUI")
+PARSER.add_argument("--port", type=int, default=8080, help="Port to run the web server on")
+
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point for the web GUI."""
-    import argparse
-    
-    parser = argparse.ArgumentParser(description="OSRS PvP RL Web GUI")
-    parser.add_argument("--port", type=int, default=8080, help="Port to run the web server on")
-    args = parser.parse_args()
+    args = PARSER.parse_args(argv)
     
-    # Check if we're in the right directory
-    current_dir = Path.cwd()
-    if not (current_dir / "pvp-ml").exists() or not (current_dir / "simulation-rsps").exists():
-        print("❌ Please run this script from the project root directory")
-        print("   Expected to find 'pvp-ml' and 'simulation-rsps' directories")
+    # Check the checkout this script belongs to, which is where every command runs from
+    project_root = Path(__file__).resolve().parent
+    with os.scandir(project_root) as entries:
+        found = {entry.name for entry in entries if entry.is_dir()}
+    if not {"pvp-ml", "simulation-rsps"} <= found:
+        print(f"❌ {project_root} doesn't look like the project root")
+        print("   Expected to find 'pvp-ml' and 'simulation-rsps' directories next to web_gui.py")
         sys.exit(1)
     
     # Create and run web GUI
-    app = OSRSWebGUI(port=args.port)
+    app = OSRSWebGUI(port=args.port, project_root=project_root)
     app.run()
 
 